@@ -6,8 +6,9 @@ from src.saver import DataSaver
 from src.db_manager import DatabaseManager
 from src.visualizer import DataVisualizer
 from src.network_visualizer import NetworkVisualizer
+from src.snapshot import ColumnarSnapshot
 
-from settings import CSV_PATH, VISUALIZATIONS_PATH
+from settings import CSV_PATH, DATABASE_PATH, VISUALIZATIONS_PATH
 import os
 
 logging.basicConfig(level=logging.INFO)
@@ -30,37 +31,60 @@ def ingest_data():
         db.initialize_database()
         db.ingest_csv(CSV_PATH)
 
+def export_snapshot():
+    with DatabaseManager() as db:
+        ColumnarSnapshot().export(db)
+
+def open_snapshot():
+    snapshot = ColumnarSnapshot()
+    if not snapshot.exists():
+        return None
+    if not snapshot.is_current(DATABASE_PATH):
+        logger.warning("Snapshot is older than the database, falling back to SQLite. Re-run export-snapshot to refresh it.")
+        return None
+    return snapshot
+
 def analyze_common_properties():
     
     visualizer = DataVisualizer(output_dir=os.path.join(VISUALIZATIONS_PATH, "common_properties"))
     
-    with DatabaseManager() as db:
-        patterns = db.analyze_common_properties(min_occurrence_percent=1.0)
+    snapshot = open_snapshot()
+    if snapshot:
+        patterns = snapshot.analyze_common_properties(min_occurrence_percent=1.0)
+    else:
+        with DatabaseManager() as db:
+            patterns = db.analyze_common_properties(min_occurrence_percent=1.0)
+    
+    for category, data in patterns.items():
+        visualizer.visualize_category(category, data)
         
-        for category, data in patterns.items():
-            visualizer.visualize_category(category, data)
-            
-        for column, values in patterns.items():
-            print(f"\nMost common {column}:")
-            for value in values:
-                print(f"- {value['value']}: {value['count']} occurrences ({value['percentage']}%)")
+    for column, values in patterns.items():
+        print(f"\nMost common {column}:")
+        for value in values:
+            print(f"- {value['value']}: {value['count']} occurrences ({value['percentage']}%)")
 
 def analyze_user_similarities():
-    with DatabaseManager() as db:
-        raw_df = db.get_users_dataframe(limit=1000)
-        df = DataTransformer.prepare_for_similarity(raw_df)
-        visualizer = NetworkVisualizer(output_dir=os.path.join(VISUALIZATIONS_PATH, "networks"))
-        visualizer.analyze_similarities(df)
+    snapshot = open_snapshot()
+    if snapshot:
+        raw_df = snapshot.get_users_dataframe(limit=1000)
+    else:
+        with DatabaseManager() as db:
+            raw_df = db.get_users_dataframe(limit=1000)
+    df = DataTransformer.prepare_for_similarity(raw_df)
+    visualizer = NetworkVisualizer(output_dir=os.path.join(VISUALIZATIONS_PATH, "networks"))
+    visualizer.analyze_similarities(df)
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument('action', choices=['fetch', 'ingest', 'all', 'analyze'])
+    parser.add_argument('action', choices=['fetch', 'ingest', 'export-snapshot', 'all', 'analyze'])
     args = parser.parse_args()
     
     if args.action in ['fetch', 'all']:
         fetch_data()
     if args.action in ['ingest', 'all']:
         ingest_data()
+    if args.action in ['export-snapshot', 'all']:
+        export_snapshot()
     if args.action == 'analyze':
         analyze_common_properties()
         analyze_user_similarities()
@@ -11,6 +11,8 @@ DATABASE_PATH = "data/users.db"
 
 CSV_PATH = "data/users.csv"
 
+SNAPSHOT_PATH = "data/users_snapshot"
+
 VISUALIZATIONS_PATH = "visualizations"
 
 USER_SCHEMA: Dict[str, str] = {
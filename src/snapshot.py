@@ -0,0 +1,243 @@
+import json
+import logging
+import os
+import shutil
+import tempfile
+from typing import List, Dict, Any, Optional, Tuple
+import numpy as np
+import pandas as pd
+from settings import SNAPSHOT_PATH, COLUMN_TYPES
+
+logger = logging.getLogger(__name__)
+
+META_FILENAME = "meta.json"
+CODE_DTYPE = np.int32
+NUMERIC_DTYPES = {
+    "INTEGER": np.int64,
+    "REAL": np.float64,
+}
+OPEN_ATTEMPTS = 3
+
+COMMON_PROPERTY_COLUMNS = [
+    'country', 'city', 'job_title', 'subscription_plan',
+    'subscription_status', 'gender', 'payment_method'
+]
+
+USER_FRAME_COLUMNS = [
+    'first_name', 'last_name', 'gender', 'date_of_birth', 'job_title',
+    'key_skill', 'city', 'state', 'latitude', 'longitude',
+    'subscription_plan', 'subscription_status', 'payment_method',
+    'subscription_term'
+]
+
+# Only what the analyses read, so credentials and per-row identifiers never land on disk twice
+SNAPSHOT_COLUMNS = list(dict.fromkeys(COMMON_PROPERTY_COLUMNS + USER_FRAME_COLUMNS))
+
+
+class ColumnarSnapshot:
+    """Columnar on-disk copy of the users table.
+
+    Every column is stored as its own ``.npy`` file that is opened
+    memory-mapped, so several processes reading the snapshot share the same
+    pages. TEXT columns are dictionary encoded: ``<column>.codes.npy`` holds
+    int32 codes (``-1`` for NULL) and ``<column>.dict.npy`` the unique values.
+
+    An export is built in a sibling temporary directory and swapped in once
+    complete, so readers never see a partially written snapshot.
+    """
+
+    def __init__(self, snapshot_dir: str = SNAPSHOT_PATH):
+        self.snapshot_dir = snapshot_dir
+        self._meta = None
+        self._arrays = {}
+
+    def exists(self) -> bool:
+        return os.path.isfile(os.path.join(self.snapshot_dir, META_FILENAME))
+
+    def is_current(self, db_path: str) -> bool:
+        return self.meta["source_mtime_ns"] == os.stat(db_path).st_mtime_ns
+
+    @staticmethod
+    def _column_kind(column: str) -> str:
+        col_type = COLUMN_TYPES.get(column, "TEXT").split()[0]
+        return col_type if col_type in NUMERIC_DTYPES else "TEXT"
+
+    def export(self, db, table_name: str = "users", batch_size: int = 10000) -> int:
+        parent_dir = os.path.dirname(os.path.abspath(self.snapshot_dir))
+        prefix = f".{os.path.basename(self.snapshot_dir)}-"
+        os.makedirs(parent_dir, exist_ok=True)
+        build_dir = tempfile.mkdtemp(prefix=prefix, dir=parent_dir)
+
+        try:
+            meta = self._build(db, table_name, batch_size, build_dir)
+            self._swap_in(build_dir, parent_dir, prefix)
+        except Exception as e:
+            logger.error(f"Error exporting snapshot: {str(e)}")
+            shutil.rmtree(build_dir, ignore_errors=True)
+            raise
+
+        self._meta = None
+        self._arrays = {}
+        logger.info(f"Exported {meta['row_count']} records to snapshot at {self.snapshot_dir}")
+        return meta["row_count"]
+
+    def _build(self, db, table_name: str, batch_size: int, build_dir: str) -> Dict[str, Any]:
+        source_mtime_ns = os.stat(db.db_path).st_mtime_ns
+        row_count = db.get_record_count(table_name)
+
+        outputs = {}
+        dictionaries = {}
+        for column in SNAPSHOT_COLUMNS:
+            kind = self._column_kind(column)
+            if kind == "TEXT":
+                outputs[column] = self._create_array(build_dir, f"{column}.codes", CODE_DTYPE, row_count)
+                dictionaries[column] = {}
+            else:
+                outputs[column] = self._create_array(build_dir, column, NUMERIC_DTYPES[kind], row_count)
+
+        query = f"SELECT {','.join(SNAPSHOT_COLUMNS)} FROM {table_name}"
+        offset = 0
+        for chunk in pd.read_sql_query(query, db.connection, chunksize=batch_size):
+            end = offset + len(chunk)
+            if end > row_count:
+                raise RuntimeError(f"Table {table_name} grew while exporting the snapshot")
+
+            for column in SNAPSHOT_COLUMNS:
+                if column in dictionaries:
+                    local_codes, uniques = pd.factorize(chunk[column], use_na_sentinel=True)
+                    lookup = dictionaries[column]
+                    # The trailing -1 is what the NULL sentinel in local_codes indexes into
+                    remap = np.array(
+                        [lookup.setdefault(value, len(lookup)) for value in uniques] + [-1],
+                        dtype=CODE_DTYPE
+                    )
+                    outputs[column][offset:end] = remap[local_codes]
+                else:
+                    outputs[column][offset:end] = chunk[column].to_numpy(dtype=outputs[column].dtype)
+            offset = end
+
+        if offset != row_count:
+            raise RuntimeError(f"Table {table_name} shrank while exporting the snapshot")
+
+        for out in outputs.values():
+            out.flush()
+        for column, lookup in dictionaries.items():
+            self._write_array(build_dir, f"{column}.dict", np.array(list(lookup), dtype=str))
+
+        meta = {
+            "row_count": row_count,
+            "source_mtime_ns": source_mtime_ns,
+            "columns": {column: self._column_kind(column) for column in SNAPSHOT_COLUMNS},
+        }
+        with open(os.path.join(build_dir, META_FILENAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        return meta
+
+    def _swap_in(self, build_dir: str, parent_dir: str, prefix: str) -> None:
+        # os.replace cannot overwrite a non-empty directory, so the old snapshot is
+        # moved aside first. Readers that already mapped its files keep their pages.
+        old_dir = None
+        if os.path.exists(self.snapshot_dir):
+            old_dir = tempfile.mkdtemp(prefix=prefix, dir=parent_dir)
+            os.replace(self.snapshot_dir, os.path.join(old_dir, "old"))
+        os.replace(build_dir, self.snapshot_dir)
+        if old_dir:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    @staticmethod
+    def _create_array(directory: str, name: str, dtype, length: int) -> np.ndarray:
+        path = os.path.join(directory, f"{name}.npy")
+        return np.lib.format.open_memmap(path, mode="w+", dtype=dtype, shape=(length,))
+
+    @staticmethod
+    def _write_array(directory: str, name: str, values: np.ndarray) -> None:
+        np.save(os.path.join(directory, f"{name}.npy"), values)
+
+    def _open(self) -> None:
+        """Maps meta.json and every column file from the same export.
+
+        If an export swaps the directory mid-open, the inode changes and the
+        open is retried, so codes are never paired with another export's dictionary.
+        """
+        for _ in range(OPEN_ATTEMPTS):
+            try:
+                inode = os.stat(self.snapshot_dir).st_ino
+                with open(os.path.join(self.snapshot_dir, META_FILENAME), encoding="utf-8") as f:
+                    meta = json.load(f)
+                arrays = {}
+                for column, kind in meta["columns"].items():
+                    names = [f"{column}.codes", f"{column}.dict"] if kind == "TEXT" else [column]
+                    for name in names:
+                        path = os.path.join(self.snapshot_dir, f"{name}.npy")
+                        arrays[name] = np.load(path, mmap_mode="r")
+                if os.stat(self.snapshot_dir).st_ino == inode:
+                    self._meta, self._arrays = meta, arrays
+                    return
+            except FileNotFoundError:
+                pass
+        raise RuntimeError(f"Snapshot at {self.snapshot_dir} kept changing while it was opened")
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        if self._meta is None:
+            self._open()
+        return self._meta
+
+    def get_record_count(self) -> int:
+        return self.meta["row_count"]
+
+    def column(self, column: str) -> np.ndarray:
+        """Returns a numeric column as a read-only memory-mapped array."""
+        if self.meta["columns"][column] == "TEXT":
+            raise ValueError(f"Column {column} is dictionary encoded, use encoded_column()")
+        return self._arrays[column]
+
+    def encoded_column(self, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the (codes, dictionary) pair of a TEXT column without decoding it."""
+        if self.meta["columns"][column] != "TEXT":
+            raise ValueError(f"Column {column} is not dictionary encoded")
+        return self._arrays[f"{column}.codes"], self._arrays[f"{column}.dict"]
+
+    def decoded_column(self, column: str, limit: Optional[int] = None) -> np.ndarray:
+        """Decodes a TEXT column into an object array of Python strings."""
+        codes, dictionary = self.encoded_column(column)
+        # The trailing None is what the -1 NULL code indexes into
+        lookup = np.append(dictionary.astype(object), None)
+        return lookup[codes[:limit]]
+
+    def analyze_common_properties(self, min_occurrence_percent: float = 1.0) -> Dict[str, List[Dict[str, Any]]]:
+        total_records = self.get_record_count()
+        min_occurrences = (total_records * min_occurrence_percent) / 100
+
+        results = {}
+
+        for column in COMMON_PROPERTY_COLUMNS:
+            codes, dictionary = self.encoded_column(column)
+            # Slot 0 counts NULLs, matching SQL's GROUP BY on a NULL value
+            counts = np.bincount(codes + 1, minlength=len(dictionary) + 1)
+            order = np.argsort(-counts, kind="stable")
+            patterns = [
+                {
+                    'value': dictionary[slot - 1].item() if slot > 0 else None,
+                    'count': int(counts[slot]),
+                    'percentage': round(float(counts[slot]) * 100.0 / total_records, 2)
+                }
+                for slot in order[:10]
+                if counts[slot] > 0 and counts[slot] >= min_occurrences
+            ]
+            if patterns:
+                results[column] = patterns
+
+        return results
+
+    def get_users_dataframe(self, limit: int = 1000) -> pd.DataFrame:
+        # TEXT columns are decoded to Python strings here, since the similarity
+        # step builds per-row descriptions from them
+        data = {}
+        for column in USER_FRAME_COLUMNS:
+            if self.meta["columns"][column] == "TEXT":
+                data[column] = self.decoded_column(column, limit=limit)
+            else:
+                data[column] = self.column(column)[:limit]
+
+        return pd.DataFrame(data, columns=USER_FRAME_COLUMNS)